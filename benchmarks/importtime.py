@@ -0,0 +1,101 @@
+"""Import-time benchmark for the API, Celery worker and ML service entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter for
+each entry point, prints the cumulative import time and the slowest imports,
+and fails if a heavy dependency is pulled in at import time or the module
+exceeds its time budget.
+
+Usage:
+    python benchmarks/importtime.py [--top N] [--budget-scale X]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = {"pandas", "sklearn", "joblib", "pyarrow", "psycopg2"}
+
+# module -> import time budget in ms
+TARGETS = {
+    "task1.main": 1500,
+    "task2.tasks": 1500,
+    "task3.ml_api": 1000,
+    "task3.train_model": 100,
+}
+
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """Return [(cumulative_us, name)] for ``module`` and everything it imports.
+
+    The target is listed last; interpreter startup imports are left out.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+            entries.append((cumulative, len(indent) > 1, name))
+
+    # Children are printed before their parent, so the target's subtree is the
+    # run of nested entries directly above its own top-level line.
+    end = max(i for i, (_, nested, name) in enumerate(entries) if name == module and not nested)
+    start = end
+    while start > 0 and entries[start - 1][1]:
+        start -= 1
+    return [(cumulative, name) for cumulative, _, name in entries[start:end + 1]]
+
+
+def check(module, budget_ms, top=5):
+    """Print a report for ``module`` and return a list of problems found"""
+    entries = measure(module)
+    total_ms = entries[-1][0] / 1000
+    imported = {name.split(".")[0] for _, name in entries}
+
+    print(f"{module}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    for cumulative, name in sorted(entries[:-1], reverse=True)[:top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+    problems = []
+    heavy = sorted(imported & HEAVY_MODULES)
+    if heavy:
+        problems.append(f"{module} imports heavy dependencies at load time: {', '.join(heavy)}")
+    if total_ms > budget_ms:
+        problems.append(f"{module} import took {total_ms:.1f} ms, budget is {budget_ms:.0f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to show per module")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every time budget, e.g. on slow CI machines")
+    args = parser.parse_args()
+
+    problems = []
+    for module, budget_ms in TARGETS.items():
+        problems += check(module, budget_ms * args.budget_scale, args.top)
+
+    if problems:
+        print("\n✗ Import-time regressions:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("\n✓ All entry points import within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Throughput benchmark for the ML API across worker counts and batch windows.
+
+Starts ``task3.ml_api`` under gunicorn (task3/gunicorn_conf.py, preloaded model)
+for every (ML_API_HTTP_WORKERS, ML_API_WORKERS, ML_API_BATCH_WINDOW_MS)
+combination, fires concurrent ``POST /predict`` requests and reports requests
+per second and latency percentiles.
+
+Usage:
+    python benchmarks/ml_throughput.py [--http-workers 1,2,4] [--workers 0]
+                                       [--windows 0,2] [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8765
+WORDS = [
+    "fix", "critical", "login", "bug", "update", "documentation", "refactor", "api",
+    "endpoint", "security", "vulnerability", "database", "query", "optimize", "ui",
+]
+
+
+def start_server(http_workers, workers, window_ms):
+    env = dict(
+        os.environ,
+        ML_API_PORT=str(PORT),
+        ML_API_HTTP_WORKERS=str(http_workers),
+        ML_API_WORKERS=str(workers),
+        ML_API_BATCH_WINDOW_MS=str(window_ms),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "task3/gunicorn_conf.py", "task3.ml_api:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{PORT}/").json()["model_loaded"]:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("ML API did not start")
+
+
+async def run_load(total, concurrency):
+    rng = random.Random(42)
+    descriptions = [" ".join(rng.choices(WORDS, k=6)) for _ in range(total)]
+    latencies = []
+    queue = asyncio.Queue()
+    for description in descriptions:
+        queue.put_nowait(description)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=30) as client:
+        async def worker():
+            while not queue.empty():
+                description = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post("/predict", json={"task_description": description})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return total / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--http-workers", default="1,2,4", help="comma-separated ML_API_HTTP_WORKERS values")
+    parser.add_argument("--workers", default="0", help="comma-separated ML_API_WORKERS values")
+    parser.add_argument("--windows", default="0,2", help="comma-separated ML_API_BATCH_WINDOW_MS values")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {os.cpu_count()} CPUs\n")
+    print(f"{'http':>6}{'pool':>6}{'window (ms)':>13}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+
+    for http_workers in [int(w) for w in args.http_workers.split(",")]:
+        for workers in [int(w) for w in args.workers.split(",")]:
+            for window_ms in [float(w) for w in args.windows.split(",")]:
+                server = start_server(http_workers, workers, window_ms)
+                try:
+                    asyncio.run(run_load(min(200, args.requests), args.concurrency))  # warm-up
+                    rps, p50, p99 = asyncio.run(run_load(args.requests, args.concurrency))
+                finally:
+                    server.terminate()
+                    server.wait()
+                print(
+                    f"{http_workers:>6}{workers:>6}{window_ms:>13g}"
+                    f"{rps:>10.0f}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
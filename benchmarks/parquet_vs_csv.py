@@ -0,0 +1,67 @@
+"""CSV vs Parquet benchmark for the task export and training input.
+
+Writes the same synthetic task rows through ``task2.export.write_rows`` in
+both formats, then loads them back with ``task3.train_model.load_training_data``
+and reports write time, file size and load time.
+
+Usage:
+    python benchmarks/parquet_vs_csv.py [--rows N] [--repeat R]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task2.export import write_rows  # noqa: E402
+from task3.train_model import load_training_data  # noqa: E402
+
+TASK_COLUMNS = {"task_description": "string", "priority": "string"}
+WORDS = [
+    "fix", "critical", "login", "bug", "update", "documentation", "refactor", "api",
+    "endpoint", "security", "vulnerability", "database", "query", "optimize", "ui",
+    "component", "release", "deploy", "review", "tests", "cache", "performance",
+]
+
+
+def make_rows(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        (" ".join(rng.choices(WORDS, k=rng.randint(3, 12))), rng.choice(["high", "low"]))
+        for _ in range(count)
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"{args.rows} rows, best of {args.repeat}\n")
+    print(f"{'format':<10}{'write (s)':>12}{'size (MB)':>12}{'load (s)':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for output_format in ("csv", "parquet"):
+            path = os.path.join(tmp, f"tasks.{output_format}")
+            write_s = best_of(args.repeat, lambda: write_rows(path, TASK_COLUMNS, rows, output_format))
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            load_s = best_of(args.repeat, lambda: load_training_data(path))
+            print(f"{output_format:<10}{write_s:>12.3f}{size_mb:>12.2f}{load_s:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,14 @@ if config.config_file_name is not None:
 from task1.models import Base  # Adjust path; Base is your SQLAlchemy declarative base
 target_metadata = Base.metadata
 
+# Database-only objects managed by hand-written migrations, not mapped on the models
+DB_ONLY_OBJECTS = {"search_vector", "ix_tasks_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from dropping objects listed in DB_ONLY_OBJECTS"""
+    return not (reflected and compare_to is None and name in DB_ONLY_OBJECTS)
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
@@ -50,6 +58,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -73,7 +82,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
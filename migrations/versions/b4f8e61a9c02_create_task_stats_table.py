@@ -0,0 +1,47 @@
+"""create task stats table
+
+Revision ID: b4f8e61a9c02
+Revises: 7c1e2a9d4b13
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f8e61a9c02'
+down_revision: Union[str, Sequence[str], None] = '7c1e2a9d4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAT_DIMENSIONS = ("status", "priority", "assigned_to", "project_id")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_stats',
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'value')
+    )
+
+    # Backfill counters from existing live tasks
+    op.execute(
+        "INSERT INTO task_stats (dimension, value, count) "
+        "SELECT 'total', 'all', count(*) FROM tasks WHERE deleted_at IS NULL"
+    )
+    for dimension in STAT_DIMENSIONS:
+        op.execute(
+            "INSERT INTO task_stats (dimension, value, count) "
+            f"SELECT '{dimension}', coalesce(CAST({dimension} AS VARCHAR), 'none'), count(*) "
+            f"FROM tasks WHERE deleted_at IS NULL GROUP BY {dimension}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_stats')
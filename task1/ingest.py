@@ -0,0 +1,218 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from task1 import stats
+from task1.models import Task
+
+load_dotenv()
+
+# Ingestion mode: POST /tasks inserts arriving within INGEST_BATCH_WINDOW_MS are committed
+# together (0 = one transaction per request). Admission control rejects with 429 when
+# INGEST_MAX_QUEUE create requests are already in flight or the connection pool is exhausted.
+# The INGEST_MAX_QUEUE default is the size of anyio's threadpool: every create request holds
+# a thread for the ML call, so more than that in flight would only queue for threads.
+INGEST_BATCH_WINDOW_MS = float(os.getenv("INGEST_BATCH_WINDOW_MS", "0"))
+INGEST_MAX_BATCH = int(os.getenv("INGEST_MAX_BATCH", "100"))
+INGEST_MAX_QUEUE = int(os.getenv("INGEST_MAX_QUEUE", "40"))
+INGEST_RETRY_AFTER = int(os.getenv("INGEST_RETRY_AFTER", "1"))
+INGEST_TIMEOUT = float(os.getenv("INGEST_TIMEOUT", "30"))
+
+
+class InsertBatcher:
+    """Coalesce concurrent task inserts into one multi-row INSERT ... RETURNING.
+
+    Request handlers ``await insert()``; a background thread collects everything
+    that arrives within ``window_ms`` (up to ``max_batch`` rows), writes it in a
+    single transaction and hands each caller its own row.
+    """
+
+    def __init__(self, window_ms, max_batch):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    async def insert(self, bind, values):
+        """Queue ``values`` for insertion and wait for the stored Task"""
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="task-insert-batcher", daemon=True)
+                self._thread.start()
+            self._queue.put((bind, values, future))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), INGEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                raise HTTPException(
+                    status_code=503,
+                    detail="Task insert timed out",
+                    headers={"Retry-After": str(INGEST_RETRY_AFTER)},
+                )
+            # Already being written: wait for it rather than report a row that will exist
+            return await asyncio.wrap_future(future)
+
+    def stop(self):
+        """Flush queued inserts and stop the background thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        by_bind = {}
+        for bind, values, future in batch:
+            # Callers that timed out have cancelled their future; don't write their row
+            if future.set_running_or_notify_cancel():
+                by_bind.setdefault(bind, []).append((values, future))
+
+        for bind, items in by_bind.items():
+            try:
+                rows = self._write(bind, [values for values, _ in items])
+            except Exception as e:
+                if len(items) == 1:
+                    items[0][1].set_exception(e)
+                    continue
+                # One bad row must not fail the whole batch: retry row by row
+                for values, future in items:
+                    try:
+                        future.set_result(self._write(bind, [values])[0])
+                    except Exception as row_error:
+                        future.set_exception(row_error)
+            else:
+                for (_, future), row in zip(items, rows):
+                    future.set_result(row)
+
+    def _write(self, bind, values):
+        with Session(bind=bind, expire_on_commit=False) as session:
+            rows = session.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True),
+                values,
+            ).all()
+            stats.record_created(session, rows)
+            session.commit()
+            return rows
+
+
+batcher = InsertBatcher(INGEST_BATCH_WINDOW_MS, INGEST_MAX_BATCH)
+
+_in_flight = 0
+_inserting = 0
+_in_flight_lock = threading.Lock()
+
+
+def _reject(reason):
+    raise HTTPException(
+        status_code=429,
+        detail=f"{reason}, retry later",
+        headers={"Retry-After": str(INGEST_RETRY_AFTER)},
+    )
+
+
+async def admit():
+    """FastAPI dependency: count a create request in flight, or reject it with 429.
+
+    Runs on the event loop before any threadpool work, so requests are counted
+    (and rejected) before they can queue behind busy threadpool threads.
+    """
+    global _in_flight
+    with _in_flight_lock:
+        if _in_flight >= INGEST_MAX_QUEUE:
+            _reject("Too many task inserts in flight")
+        # Rows of timed-out requests stay queued after they stop counting as in flight
+        if batcher.enabled and batcher.depth >= INGEST_MAX_QUEUE:
+            _reject("Task insert queue is full")
+        _in_flight += 1
+    try:
+        yield
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
+
+
+def pool_capacity(bind):
+    """Number of connections the pool may open, or None when it is unbounded"""
+    pool = bind.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    # QueuePool exposes no public accessor for max_overflow; -1 means unlimited
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return None
+    return pool.size() + max_overflow
+
+
+def pool_saturated(bind):
+    """True when every connection the pool may open is checked out"""
+    capacity = pool_capacity(bind)
+    return capacity is not None and bind.pool.checkedout() >= capacity
+
+
+def check_pool(bind):
+    """Reject with 429 + Retry-After instead of queueing behind a saturated database"""
+    if pool_saturated(bind):
+        _reject("Database connection pool is saturated")
+
+
+@contextmanager
+def insert_slot(bind):
+    """Reserve one of the pool's connections for an unbatched insert, or reject with 429.
+
+    Never waits: inserts that already passed the check but haven't checked out
+    their connection yet are counted too, so a burst can't oversubscribe the pool.
+    """
+    global _inserting
+    with _in_flight_lock:
+        capacity = pool_capacity(bind)
+        if capacity is not None and _inserting >= capacity:
+            _reject("Database connection pool is saturated")
+        check_pool(bind)
+        _inserting += 1
+    try:
+        yield
+    finally:
+        with _in_flight_lock:
+            _inserting -= 1
@@ -1,16 +1,25 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from fastapi import status
 
+import asyncio
 import requests
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timezone
+from contextlib import asynccontextmanager
 
-from task1 import models, dependencies
-from task1.schemas import TaskCreate, TaskUpdate, TaskOut
+from task1 import models, dependencies, search, stats, ingest
+from task1.schemas import TaskCreate, TaskUpdate, TaskOut, TaskStats
 
-app = FastAPI(title="To-Do List API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Commit inserts still waiting in the ingestion batcher before exiting
+    await asyncio.to_thread(ingest.batcher.stop)
+
+app = FastAPI(title="To-Do List API", lifespan=lifespan)
 
 @app.get("/")
 def root():
@@ -20,6 +29,19 @@ def root():
 def get_tasks(db: Session = Depends(dependencies.get_db)):
     return db.query(models.Task).filter(models.Task.deleted_at == None).all()
 
+@app.get("/tasks/stats", response_model=TaskStats)
+def get_task_stats(db: Session = Depends(dependencies.get_db)):
+    return stats.get_stats(db)
+
+@app.get("/tasks/search", response_model=List[TaskOut])
+def search_tasks(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(dependencies.get_db),
+):
+    return search.search_tasks(db, q, limit, offset)
+
 @app.get("/tasks/{task_id}", response_model=TaskOut)
 def get_task(task_id: int, db: Session = Depends(dependencies.get_db)):
     task = db.query(models.Task).filter(models.Task.id == task_id, models.Task.deleted_at == None).first()
@@ -27,18 +49,8 @@ def get_task(task_id: int, db: Session = Depends(dependencies.get_db)):
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
-@app.post("/tasks", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
-def create_task(task: TaskCreate, db: Session = Depends(dependencies.get_db)):
-    new_task = models.Task(
-        title=task.title,
-        description=task.description,
-        completed=task.completed or False
-    )
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
-    
-    description = new_task.description or new_task.title
+def predict_priority(description: str) -> Optional[str]:
+    """Ask the ML API for a priority; None if it is unavailable or unsure"""
     try:
         ml_response = requests.post(
             "http://keymakr-ml-api:8001/predict",  
@@ -48,32 +60,75 @@ def create_task(task: TaskCreate, db: Session = Depends(dependencies.get_db)):
         if ml_response.status_code == 200:
             predicted_priority = ml_response.json().get("predicted_priority")
             if predicted_priority in ["high", "low"]:
-                new_task.priority = predicted_priority
-                db.commit()
-                db.refresh(new_task)
-                print(f"Predicted priority '{predicted_priority}' for task '{new_task.title}'")
+                return predicted_priority
     except requests.RequestException as e:
         print(f"ML prediction failed: {e} (priority remains null)")
-    
+    return None
+
+def insert_task(db: Session, values: dict) -> models.Task:
+    new_task = models.Task(**values)
+    db.add(new_task)
+    db.flush()
+    stats.record_change(db, None, stats.task_groups(new_task))
+    db.commit()
+    db.refresh(new_task)
+    return new_task
+
+@app.post(
+    "/tasks",
+    response_model=TaskOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(ingest.admit)],
+)
+async def create_task(task: TaskCreate, db: Session = Depends(dependencies.get_db)):
+    # Predict first so the row is written once, priority included, in a single transaction
+    priority = await run_in_threadpool(predict_priority, task.description or task.title)
+    values = {
+        "title": task.title,
+        "description": task.description,
+        "completed": task.completed or False,
+        "priority": priority,
+    }
+    # Pool checks go right before the insert: the ML call above can take seconds
+    bind = db.get_bind()
+    if ingest.batcher.enabled:
+        ingest.check_pool(bind)
+        new_task = await ingest.batcher.insert(bind, values)
+    else:
+        with ingest.insert_slot(bind):
+            new_task = await run_in_threadpool(insert_task, db, values)
+
+    if priority:
+        print(f"Predicted priority '{priority}' for task '{new_task.title}'")
     return new_task
 
 @app.put("/tasks/{task_id}", response_model=TaskOut)
 def update_task(task_id: int, task_update: TaskUpdate, db: Session = Depends(dependencies.get_db)):
-    task = db.query(models.Task).filter(models.Task.id == task_id, models.Task.deleted_at == None).first()
+    # Row lock: a concurrent update/delete must see this one's groups before moving counters
+    task = (
+        db.query(models.Task)
+        .filter(models.Task.id == task_id, models.Task.deleted_at == None)
+        .with_for_update()
+        .first()
+    )
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    before = stats.task_groups(task)
     for key, value in task_update.model_dump(exclude_unset=True).items():
         setattr(task, key, value)
     if task.completed:
         task.status = "done"
+    stats.record_change(db, before, stats.task_groups(task))
     db.commit()
     db.refresh(task)
     return task
 
 @app.delete("/tasks/{task_id}", status_code=204)
 def delete_task(task_id: int, db: Session = Depends(dependencies.get_db)):
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    task = db.query(models.Task).filter(models.Task.id == task_id).with_for_update().first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    if task.deleted_at is None:
+        stats.record_change(db, stats.task_groups(task), None)
     task.deleted_at = datetime.now(timezone.utc)
     db.commit()
\ No newline at end of file
@@ -17,3 +17,12 @@ class Task(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class TaskStat(Base):
+    """Live task count per (dimension, value), maintained on every task write"""
+    __tablename__ = "task_stats"
+
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 class TaskCreate(BaseModel):
@@ -27,3 +27,10 @@ class TaskOut(BaseModel):
     model_config = {
         "from_attributes": True
     }
+
+class TaskStats(BaseModel):
+    total: int
+    status: Dict[str, int]
+    priority: Dict[str, int]
+    assigned_to: Dict[str, int]
+    project_id: Dict[str, int]
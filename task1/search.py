@@ -0,0 +1,91 @@
+import re
+import weakref
+
+from sqlalchemy import DDL, column, event, func, literal_column, table, text
+from sqlalchemy.orm import Session
+
+from task1.models import Task
+
+# Postgres: tasks.search_vector is a generated tsvector column with a GIN index,
+# added by migration 7c1e2a9d4b13. It is not mapped on the model and only used here.
+SEARCH_CONFIG = "english"
+
+# SQLite (tests, local runs): an external-content FTS5 table kept in sync by triggers
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts "
+    "USING fts5(title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+]
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"))
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
+
+# Engines whose tasks_fts has been checked in this process
+_fts_ready = weakref.WeakSet()
+
+
+def ensure_sqlite_fts(engine):
+    """Create tasks_fts for a tasks table that predates it and index existing rows.
+
+    The after_create hooks only fire when tasks itself is created, so databases
+    created before full-text search have no index until the first search.
+    """
+    if engine in _fts_ready:
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+        ).first()
+        for statement in SQLITE_FTS_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    _fts_ready.add(engine)
+
+
+def _fts5_query(q: str) -> str:
+    """Quote every word so user input can't break FTS5 query syntax"""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+
+
+def search_tasks(db: Session, q: str, limit: int, offset: int):
+    """Return non-deleted tasks matching ``q``, best matches first"""
+    query = db.query(Task).filter(Task.deleted_at == None)
+
+    if db.get_bind().dialect.name == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return []
+        ensure_sqlite_fts(db.get_bind())
+        query = (
+            query.join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .filter(text("tasks_fts MATCH :match"))
+            .params(match=match)
+            .order_by(tasks_fts.c.rank, Task.id)
+        )
+    else:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        search_vector = literal_column("tasks.search_vector")
+        query = (
+            query.filter(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank(search_vector, ts_query).desc(), Task.id)
+        )
+
+    return query.offset(offset).limit(limit).all()
@@ -0,0 +1,113 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from task1.models import Task, TaskStat
+
+STAT_DIMENSIONS = ("status", "priority", "assigned_to", "project_id")
+TOTAL = ("total", "all")
+NONE_VALUE = "none"
+
+
+def task_groups(task):
+    """Return the (dimension, value) groups a live task is counted in"""
+    groups = [TOTAL]
+    for dimension in STAT_DIMENSIONS:
+        value = getattr(task, dimension)
+        groups.append((dimension, NONE_VALUE if value is None else str(value)))
+    return groups
+
+
+def _upsert(db: Session, dimension: str, value: str, delta: int):
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    stmt = insert(TaskStat).values(dimension=dimension, value=value, count=delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TaskStat.dimension, TaskStat.value],
+        set_={"count": TaskStat.count + delta},
+    )
+    db.execute(stmt)
+
+
+def _apply(db: Session, deltas):
+    # Fixed lock order so concurrent writers can't deadlock on counter rows
+    for (dimension, value), delta in sorted(deltas.items()):
+        if delta:
+            _upsert(db, dimension, value, delta)
+
+
+def record_change(db: Session, before, after):
+    """Move counters from the ``before`` groups to the ``after`` groups.
+
+    Pass ``None`` as ``before`` for a new task and as ``after`` for a deleted one.
+    Runs in the caller's transaction, so counters commit together with the task.
+    """
+    deltas = {}
+    for group in before or []:
+        deltas[group] = deltas.get(group, 0) - 1
+    for group in after or []:
+        deltas[group] = deltas.get(group, 0) + 1
+    _apply(db, deltas)
+
+
+def record_created(db: Session, tasks):
+    """Count a batch of new tasks with one upsert per affected group"""
+    deltas = {}
+    for task in tasks:
+        for group in task_groups(task):
+            deltas[group] = deltas.get(group, 0) + 1
+    _apply(db, deltas)
+
+
+def get_stats(db: Session):
+    """Read grouped counts from the summary table, O(groups)"""
+    stats = {"total": 0, **{dimension: {} for dimension in STAT_DIMENSIONS}}
+    for row in db.query(TaskStat).filter(TaskStat.count > 0).all():
+        if (row.dimension, row.value) == TOTAL:
+            stats["total"] = row.count
+        elif row.dimension in STAT_DIMENSIONS:
+            stats[row.dimension][row.value] = row.count
+    return stats
+
+
+def compute_stats(db: Session):
+    """Recount every group from the tasks table, O(rows)"""
+    live = db.query(Task).filter(Task.deleted_at == None)
+    counts = {TOTAL: live.count()}
+    for dimension in STAT_DIMENSIONS:
+        column = getattr(Task, dimension)
+        rows = (
+            db.query(column, func.count())
+            .filter(Task.deleted_at == None)
+            .group_by(column)
+            .all()
+        )
+        for value, count in rows:
+            counts[(dimension, NONE_VALUE if value is None else str(value))] = count
+    return counts
+
+
+def reconcile(db: Session):
+    """Correct drifted counters and return how many groups were fixed.
+
+    Counters and tasks are read from one snapshot without locks, so writers are
+    not blocked during the O(rows) recount. The drift found there is then applied
+    as deltas in a short transaction; concurrent writes in between don't change
+    the drift, so nothing has to be locked for the whole recount.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    stored = {(row.dimension, row.value): row.count for row in db.query(TaskStat).all()}
+    expected = compute_stats(db)
+    db.rollback()
+
+    drift = {
+        group: expected.get(group, 0) - stored.get(group, 0)
+        for group in set(expected) | set(stored)
+    }
+    drift = {group: delta for group, delta in drift.items() if delta}
+    _apply(db, drift)
+    db.commit()
+    return len(drift)
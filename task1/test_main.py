@@ -1,10 +1,16 @@
+import os
+import subprocess
+import sys
+
 import pytest
 import requests
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from unittest.mock import patch, MagicMock
 
+from task1 import search
 from task1.main import app
 from task1.database import Base
 from task1.dependencies import get_db
@@ -179,6 +185,285 @@ def test_create_task_ml_invalid_priority():
 
         assert response.status_code == 201
 
+def test_search_tasks():
+    client.post("/tasks", json={"title": "Fix login bug", "description": "Login fails on Safari"})
+    client.post("/tasks", json={"title": "Update docs", "description": "Mention the login bug workaround"})
+    client.post("/tasks", json={"title": "Refactor old code"})
+
+    response = client.get("/tasks/search", params={"q": "login bug"})
+    assert response.status_code == 200
+    titles = [task["title"] for task in response.json()]
+    assert set(titles) == {"Fix login bug", "Update docs"}
+
+def test_search_tasks_excludes_deleted_and_updated():
+    task_id = client.post("/tasks", json={"title": "Security patch"}).json()["id"]
+    other_id = client.post("/tasks", json={"title": "Security audit"}).json()["id"]
+
+    client.delete(f"/tasks/{task_id}")
+    client.put(f"/tasks/{other_id}", json={"title": "Compliance audit"})
+
+    response = client.get("/tasks/search", params={"q": "security"})
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = client.get("/tasks/search", params={"q": "compliance"})
+    assert [task["id"] for task in response.json()] == [other_id]
+
+def test_search_tasks_pagination():
+    for i in range(5):
+        client.post("/tasks", json={"title": f"Deploy service {i}"})
+
+    first = client.get("/tasks/search", params={"q": "deploy", "limit": 2}).json()
+    second = client.get("/tasks/search", params={"q": "deploy", "limit": 2, "offset": 2}).json()
+
+    assert len(first) == 2
+    assert len(second) == 2
+    assert not {task["id"] for task in first} & {task["id"] for task in second}
+
+def test_search_tasks_indexes_preexisting_table():
+    client.post("/tasks", json={"title": "Legacy import job"})
+    # A tasks table created before full-text search existed has no FTS objects
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE tasks_fts")
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    search._fts_ready.discard(engine)
+
+    response = client.get("/tasks/search", params={"q": "legacy"})
+    assert [task["title"] for task in response.json()] == ["Legacy import job"]
+
+    client.post("/tasks", json={"title": "Legacy export job"})
+    response = client.get("/tasks/search", params={"q": "export"})
+    assert [task["title"] for task in response.json()] == ["Legacy export job"]
+
+def test_search_tasks_validation():
+    assert client.get("/tasks/search").status_code == 422
+    assert client.get("/tasks/search", params={"q": ""}).status_code == 422
+    assert client.get("/tasks/search", params={"q": "x", "limit": 0}).status_code == 422
+    assert client.get("/tasks/search", params={"q": "\"*"}).json() == []
+
+def test_task_stats():
+    first_id = client.post("/tasks", json={"title": "Task 1"}).json()["id"]
+    second_id = client.post("/tasks", json={"title": "Task 2"}).json()["id"]
+    client.post("/tasks", json={"title": "Task 3"})
+
+    client.put(f"/tasks/{first_id}", json={"completed": True})
+    client.delete(f"/tasks/{second_id}")
+    client.delete(f"/tasks/{second_id}")
+
+    response = client.get("/tasks/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert data["status"] == {"todo": 1, "done": 1}
+    assert data["assigned_to"] == {"none": 2}
+
+def test_task_stats_with_ml_priority():
+    with patch('requests.post') as mock_post:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"predicted_priority": "high"}
+        mock_post.return_value = mock_response
+
+        client.post("/tasks", json={"title": "Critical Security Bug"})
+
+    assert client.get("/tasks/stats").json()["priority"] == {"high": 1}
+
+def test_reconcile_task_stats():
+    from task1 import stats
+    from task1.models import TaskStat
+
+    client.post("/tasks", json={"title": "Task 1"})
+    client.post("/tasks", json={"title": "Task 2"})
+
+    db = TestingSessionLocal()
+    try:
+        db.query(TaskStat).filter(TaskStat.dimension == "total").update({"count": 7})
+        db.add(TaskStat(dimension="status", value="stale", count=3))
+        db.commit()
+
+        assert stats.reconcile(db) == 2
+        assert stats.reconcile(db) == 0
+    finally:
+        db.close()
+
+    data = client.get("/tasks/stats").json()
+    assert data["total"] == 2
+    assert data["status"] == {"todo": 2}
+
+def test_create_task_batched_inserts(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from task1 import ingest
+
+    batcher = ingest.InsertBatcher(window_ms=200, max_batch=100)
+    flushed = []
+    flush = batcher._flush
+    monkeypatch.setattr(batcher, "_flush", lambda batch: (flushed.append(len(batch)), flush(batch)))
+    monkeypatch.setattr(ingest, "batcher", batcher)
+
+    with patch('requests.post') as mock_post:
+        mock_post.side_effect = requests.exceptions.RequestException("ML API unavailable")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(
+                lambda i: client.post("/tasks", json={"title": f"Batched {i}"}),
+                range(8),
+            ))
+    batcher.stop()
+
+    assert [response.status_code for response in responses] == [201] * 8
+    assert [response.json()["title"] for response in responses] == [f"Batched {i}" for i in range(8)]
+    assert len({response.json()["id"] for response in responses}) == 8
+    assert sum(flushed) == 8
+    assert len(flushed) < 8
+    assert client.get("/tasks/stats").json()["total"] == 8
+
+def test_create_task_rejected_when_queue_full(monkeypatch):
+    from task1 import ingest
+
+    monkeypatch.setattr(ingest, "INGEST_MAX_QUEUE", 0)
+
+    response = client.post("/tasks", json={"title": "Rejected"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(ingest.INGEST_RETRY_AFTER)
+    assert client.get("/tasks").json() == []
+
+def test_create_task_admission_under_real_server(monkeypatch):
+    """In-flight limit below the threadpool size must turn excess load into 429s"""
+    import socket
+    import threading
+    import time
+    import uvicorn
+    from concurrent.futures import ThreadPoolExecutor
+    from task1 import ingest
+
+    batcher = ingest.InsertBatcher(window_ms=50, max_batch=100)
+    flush = batcher._flush
+    monkeypatch.setattr(batcher, "_flush", lambda batch: (time.sleep(0.5), flush(batch)))
+    monkeypatch.setattr(ingest, "batcher", batcher)
+    monkeypatch.setattr(ingest, "INGEST_MAX_QUEUE", 5)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    try:
+        with patch('requests.post') as mock_post:
+            mock_post.side_effect = requests.exceptions.RequestException("ML API unavailable")
+            with ThreadPoolExecutor(max_workers=30) as pool:
+                responses = list(pool.map(
+                    lambda i: requests.request(
+                        "POST", f"http://127.0.0.1:{port}/tasks", json={"title": f"Burst {i}"}, timeout=10
+                    ),
+                    range(30),
+                ))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    codes = [response.status_code for response in responses]
+    created = [response.json()["id"] for response in responses if response.status_code == 201]
+    assert set(codes) == {201, 429}
+    assert all(r.headers["Retry-After"] == str(ingest.INGEST_RETRY_AFTER) for r in responses if r.status_code == 429)
+    assert len(set(created)) == len(created)
+    assert client.get("/tasks/stats").json()["total"] == len(created)
+
+def test_create_task_timeout_does_not_insert_later(monkeypatch):
+    from task1 import ingest
+
+    batcher = ingest.InsertBatcher(window_ms=500, max_batch=100)
+    monkeypatch.setattr(ingest, "batcher", batcher)
+    monkeypatch.setattr(ingest, "INGEST_TIMEOUT", 0.1)
+
+    with patch('requests.post') as mock_post:
+        mock_post.side_effect = requests.exceptions.RequestException("ML API unavailable")
+        response = client.post("/tasks", json={"title": "Too slow"})
+    batcher.stop()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(ingest.INGEST_RETRY_AFTER)
+    assert client.get("/tasks").json() == []
+
+def test_create_task_rejected_when_batch_queue_full(monkeypatch):
+    from task1 import ingest
+
+    monkeypatch.setattr(ingest, "batcher", MagicMock(enabled=True, depth=5))
+    monkeypatch.setattr(ingest, "INGEST_MAX_QUEUE", 5)
+
+    response = client.post("/tasks", json={"title": "Rejected"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(ingest.INGEST_RETRY_AFTER)
+    ingest.batcher.insert.assert_not_called()
+
+def test_batch_insert_isolates_bad_row():
+    from concurrent.futures import Future
+    from task1 import ingest
+
+    batcher = ingest.InsertBatcher(window_ms=10, max_batch=100)
+    futures = [Future() for _ in range(3)]
+    batcher._flush([
+        (engine, {"title": "Good 1", "completed": False}, futures[0]),
+        (engine, {"title": None, "completed": False}, futures[1]),
+        (engine, {"title": "Good 2", "completed": False}, futures[2]),
+    ])
+
+    assert futures[0].result().title == "Good 1"
+    assert futures[2].result().title == "Good 2"
+    assert futures[1].exception() is not None
+    assert client.get("/tasks/stats").json()["total"] == 2
+
+def test_create_task_rejected_when_pool_saturated():
+    from task1 import ingest
+
+    bind = MagicMock()
+    bind.pool.size.return_value = 5
+    bind.pool._max_overflow = 10
+    bind.pool.checkedout.return_value = 15
+
+    with pytest.raises(HTTPException) as exc_info:
+        ingest.check_pool(bind)
+    assert exc_info.value.status_code == 429
+
+    bind.pool.checkedout.return_value = 14
+    ingest.check_pool(bind)
+
+def test_insert_slots_bounded_by_pool_capacity():
+    from task1 import ingest
+
+    bind = MagicMock()
+    bind.pool.size.return_value = 1
+    bind.pool._max_overflow = 1
+    bind.pool.checkedout.return_value = 0
+
+    with ingest.insert_slot(bind), ingest.insert_slot(bind):
+        # Neither insert has checked out its connection yet
+        with pytest.raises(HTTPException) as exc_info:
+            with ingest.insert_slot(bind):
+                pass
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers["Retry-After"] == str(ingest.INGEST_RETRY_AFTER)
+
+    with ingest.insert_slot(bind):
+        pass
+    assert ingest._inserting == 0
+
+def test_create_task_checks_pool_after_prediction(monkeypatch):
+    from task1 import ingest
+
+    monkeypatch.setattr(ingest, "pool_saturated", lambda bind: True)
+
+    with patch('requests.post') as mock_post:
+        mock_post.side_effect = requests.exceptions.RequestException("ML API unavailable")
+        response = client.post("/tasks", json={"title": "Rejected"})
+
+    assert response.status_code == 429
+    assert mock_post.called
+    assert client.get("/tasks").json() == []
+
 def test_get_db_dependency():
     """Test database dependency for coverage"""
     from task1.dependencies import get_db
@@ -191,4 +476,17 @@ def test_get_db_dependency():
     try:
         next(db_gen)
     except StopIteration:
-        pass 
\ No newline at end of file
+        pass
+
+
+def test_entry_points_import_without_heavy_dependencies():
+    """Worker and ML service startup must not pull in the ML stack or open a DB driver"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, task2.tasks, task3.ml_api, task3.train_model, task1.main; "
+        "print(sorted({'pandas', 'sklearn', 'joblib', 'psycopg2'} & set(sys.modules)))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
@@ -26,4 +26,8 @@ app.conf.beat_schedule = {
         "task": "task2.tasks.fetch_and_save_users",
         "schedule": crontab(minute="*/5"),
     },
+    "reconcile-task-stats-every-hour": {
+        "task": "task2.tasks.reconcile_task_stats",
+        "schedule": crontab(minute=0),
+    },
 }
\ No newline at end of file
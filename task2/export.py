@@ -0,0 +1,49 @@
+import csv
+from itertools import islice
+
+OUTPUT_FORMATS = ("csv", "parquet")
+CHUNK_SIZE = 10_000
+PARQUET_COMPRESSION = "zstd"
+
+
+def check_output_format(output_format):
+    """Raise ValueError unless ``output_format`` is a supported format (also the file extension)"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unsupported output format '{output_format}', expected one of: {', '.join(OUTPUT_FORMATS)}"
+        )
+
+
+def write_rows(filename, columns, rows, output_format="csv", chunk_size=CHUNK_SIZE):
+    """Stream row tuples to a CSV or Parquet file and return the number of rows written.
+
+    ``columns`` maps column names to Arrow type aliases ("int64", "string", ...).
+    Parquet output is written chunk by chunk, one compressed row group per chunk,
+    so memory stays bounded by ``chunk_size`` rows.
+    """
+    check_output_format(output_format)
+    count = 0
+
+    if output_format == "csv":
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(columns))
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.type_for_alias(alias)) for name, alias in columns.items()])
+    rows = iter(rows)
+    with pq.ParquetWriter(filename, schema, compression=PARQUET_COMPRESSION) as writer:
+        while chunk := list(islice(rows, chunk_size)):
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(chunk)
+    return count
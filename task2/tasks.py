@@ -1,17 +1,19 @@
-import requests
-import csv
 from datetime import UTC, datetime
 from task2.celery_app import app
-
-from task1.database import SessionLocal
-from task1.models import Task
+from task2.export import CHUNK_SIZE, check_output_format, write_rows
 
 ML_API_URL = "http://keymakr-ml-api:8001/predict"
 
+USER_COLUMNS = {"id": "int64", "name": "string", "email": "string"}
+TASK_COLUMNS = {"task_description": "string", "priority": "string"}
+
 @app.task(name="task2.tasks.fetch_and_save_users")
-def fetch_and_save_users():
-    """Get users from API and save to CSV"""
+def fetch_and_save_users(output_format="csv"):
+    """Get users from API and save to CSV or Parquet"""
+    import requests
+
     try:
+        check_output_format(output_format)
         response = requests.get(
             "https://jsonplaceholder.typicode.com/users",
             timeout=10
@@ -19,18 +21,14 @@ def fetch_and_save_users():
         response.raise_for_status()
         users = response.json()
         
-        filename = f"users_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=["id", "name", "email"])
-            writer.writeheader()
-            
-            for user in users:
-                writer.writerow({
-                    "id": user["id"],
-                    "name": user["name"],
-                    "email": user["email"]
-                })
+        filename = f"users_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.{output_format}"
+
+        write_rows(
+            filename,
+            USER_COLUMNS,
+            ((user["id"], user["name"], user["email"]) for user in users),
+            output_format,
+        )
         
         print(f"✓ Saved {len(users)} users to {filename}")
         return {"status": "success", "file": filename, "count": len(users)}
@@ -40,21 +38,26 @@ def fetch_and_save_users():
         return {"status": "error", "message": str(e)}
     
 @app.task(name="task2.tasks.generate_tasks_csv")
-def generate_tasks_csv():
-    """Call ML API for each task and save to CSV"""
+def generate_tasks_csv(output_format="csv"):
+    """Call ML API for each task and save to CSV or Parquet"""
+    import requests
+    from task1.database import SessionLocal
+    from task1.models import Task
+
     db = SessionLocal()
 
     try:
+        check_output_format(output_format)
         tasks = (
             db.query(Task)
             .filter(Task.deleted_at.is_(None))
-            .all()
+            .order_by(Task.id)
         )
 
         timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-        filename = f"tasks_{timestamp}.csv"
+        filename = f"tasks_{timestamp}.{output_format}"
         
-        if not tasks:
+        if tasks.first() is None:
             print("No tasks in database, generating sample data...")
             sample_data = [
                 ("Fix login bug on website", "high"),
@@ -75,10 +78,7 @@ def generate_tasks_csv():
                 ("Update README file", "low"),
             ]
 
-            with open(filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["task_description", "priority"])
-                writer.writerows(sample_data)
+            write_rows(filename, TASK_COLUMNS, sample_data, output_format)
             
             print(f"✓ Generated {len(sample_data)} sample tasks to {filename}")
             return {
@@ -88,11 +88,8 @@ def generate_tasks_csv():
                 "source": "sample_data"
             }
 
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["task_description", "priority"])
-
-            for task in tasks:
+        def predicted_rows():
+            for task in tasks.yield_per(CHUNK_SIZE):
                 description = task.description or task.title
 
                 try:
@@ -107,52 +104,77 @@ def generate_tasks_csv():
                     print(f"ML API error for '{description}': {e}")
                     priority = getattr(task, 'priority', 'medium')
 
-                writer.writerow([description, priority])
+                yield description, priority
 
-        print(f"✓ Exported {len(tasks)} tasks to {filename}")
+        count = write_rows(filename, TASK_COLUMNS, predicted_rows(), output_format)
+
+        print(f"✓ Exported {count} tasks to {filename}")
         return {
             "status": "success",
             "file": filename,
-            "count": len(tasks),
+            "count": count,
             "source": "database"
         }
     
     except Exception as e:
-        print(f"✗ Error generating tasks CSV: {str(e)}")
+        print(f"✗ Error generating tasks {output_format}: {str(e)}")
         return {"status": "error", "message": str(e)}
 
     finally:
         db.close()
         
+@app.task(name="task2.tasks.reconcile_task_stats")
+def reconcile_task_stats():
+    """Recount task stats from the tasks table and fix counter drift"""
+    from task1.database import SessionLocal
+    from task1 import stats
+
+    db = SessionLocal()
+
+    try:
+        corrected = stats.reconcile(db)
+        print(f"✓ Task stats reconciled, {corrected} counters corrected")
+        return {"status": "success", "corrected": corrected}
+
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Error reconciling task stats: {str(e)}")
+        return {"status": "error", "message": str(e)}
+
+    finally:
+        db.close()
+
 @app.task(name="task2.tasks.train_ml_model")
-def train_ml_model():
-    """Generate CSV and train ML model using existing train_model.py"""
+def train_ml_model(output_format="csv"):
+    """Generate CSV or Parquet data and train ML model using existing train_model.py"""
     try:
-        print("Step 1: Generating tasks CSV...")
-        csv_result = generate_tasks_csv()
+        print(f"Step 1: Generating tasks {output_format}...")
+        export_result = generate_tasks_csv(output_format)
         
-        if csv_result["status"] != "success":
-            return {"status": "error", "message": "Failed to generate CSV"}
+        if export_result["status"] != "success":
+            return {"status": "error", "message": f"Failed to generate tasks {output_format}"}
         
-        csv_file = csv_result["file"]
-        print(f"✓ CSV generated: {csv_file}")
+        data_file = export_result["file"]
+        print(f"✓ Training data generated: {data_file}")
         
+        data_path = f"tasks.{output_format}"
         import shutil
-        shutil.copy(csv_file, "tasks.csv")
-        print("✓ CSV copied to tasks.csv")
+        shutil.copy(data_file, data_path)
+        print(f"✓ Training data copied to {data_path}")
         
         print("Step 2: Training ML model...")
         from task3.train_model import train_model
         
-        train_model()
+        train_model(force=True, data_path=data_path)
         
-        print(f"✓ ML model trained successfully using {csv_file}")
+        print(f"✓ ML model trained successfully using {data_file}")
         return {
             "status": "success",
             "message": "ML model trained successfully",
-            "csv_file": csv_file,
-            "tasks_count": csv_result["count"],
-            "source": csv_result.get("source", "database")
+            "csv_file": data_file,
+            "data_file": data_file,
+            "tasks_count": export_result["count"],
+            "source": export_result.get("source", "database")
         }
         
     except Exception as e:
@@ -0,0 +1,68 @@
+import csv
+
+import pyarrow.parquet as pq
+import pytest
+
+from task2.export import check_output_format, write_rows
+from task3.train_model import load_training_data
+
+COLUMNS = {"id": "int64", "title": "string", "assignee": "string"}
+ROWS = [(i, f"Task {i}", None if i % 3 == 0 else f"user{i}") for i in range(25)]
+
+
+def test_write_rows_parquet_round_trip(tmp_path):
+    filename = tmp_path / "tasks.parquet"
+
+    count = write_rows(str(filename), COLUMNS, iter(ROWS), "parquet", chunk_size=10)
+
+    assert count == 25
+    parquet_file = pq.ParquetFile(filename)
+    assert parquet_file.metadata.num_rows == 25
+    assert parquet_file.metadata.num_row_groups == 3
+    assert [parquet_file.metadata.row_group(i).num_rows for i in range(3)] == [10, 10, 5]
+    assert parquet_file.metadata.row_group(0).column(0).compression == "ZSTD"
+    assert parquet_file.schema_arrow.names == list(COLUMNS)
+    assert [tuple(row.values()) for row in parquet_file.read().to_pylist()] == ROWS
+
+
+def test_write_rows_csv_header(tmp_path):
+    filename = tmp_path / "tasks.csv"
+
+    count = write_rows(str(filename), COLUMNS, iter(ROWS), "csv")
+
+    assert count == 25
+    with open(filename, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "title", "assignee"]
+    assert rows[1] == ["0", "Task 0", ""]
+    assert len(rows) == 26
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_write_rows_empty(tmp_path, output_format):
+    filename = tmp_path / f"tasks.{output_format}"
+
+    assert write_rows(str(filename), COLUMNS, iter([]), output_format) == 0
+    assert filename.exists()
+
+
+def test_check_output_format():
+    check_output_format("csv")
+    check_output_format("parquet")
+    with pytest.raises(ValueError, match="Unsupported output format 'xlsx'"):
+        check_output_format("xlsx")
+    with pytest.raises(ValueError):
+        write_rows("unused.json", COLUMNS, iter(ROWS), "json")
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_load_training_data_reads_training_columns(tmp_path, output_format):
+    filename = str(tmp_path / f"tasks.{output_format}")
+    columns = {"id": "int64", "task_description": "string", "priority": "string", "status": "string"}
+    rows = [(1, "Fix login bug", "high", "todo"), (2, "Update docs", "low", "done")]
+    write_rows(filename, columns, rows, output_format)
+
+    data = load_training_data(filename)
+
+    assert list(data.columns) == ["task_description", "priority"]
+    assert data.values.tolist() == [["Fix login bug", "high"], ["Update docs", "low"]]
@@ -0,0 +1,25 @@
+"""Gunicorn config for the ML API production mode.
+
+    gunicorn -c task3/gunicorn_conf.py task3.ml_api:app
+
+The app is imported once in the master (preload_app), which loads the model;
+the HTTP workers are then forked and share it copy-on-write, so HTTP parsing,
+validation, JSON and inference all scale with ML_API_HTTP_WORKERS.
+"""
+import gc
+import multiprocessing
+import os
+
+os.environ["ML_API_PRELOAD"] = "1"
+
+bind = f"0.0.0.0:{os.getenv('ML_API_PORT', '8001')}"
+workers = int(os.getenv("ML_API_HTTP_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = int(os.getenv("ML_API_DRAIN_TIMEOUT", "30"))
+
+
+def pre_fork(server, worker):
+    # Move the loaded model out of the GC's tracked generations so collections in
+    # the workers don't touch (and copy) its pages
+    gc.freeze()
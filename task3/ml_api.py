@@ -1,47 +1,214 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import joblib
+from pydantic import BaseModel, Field
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import List
+import multiprocessing
+import asyncio
 import os
 
-app = FastAPI(title="Task Priority Prediction API")
-
 MODEL_PATH = "task3/priority_model.pkl"
 model = None
 
-if os.path.exists(MODEL_PATH):
-    model = joblib.load(MODEL_PATH)
-    print("✓ Model loaded successfully")
-else:
-    print("⚠ Model not found. Run train_model.py first.")
+# Production serving runs under gunicorn with --preload (see task3/gunicorn_conf.py), which
+# sets ML_API_PRELOAD so the model is loaded once in the master and shared copy-on-write
+# by the forked HTTP workers.
+# Per HTTP process: number of forked inference processes (0 = in-process threadpool),
+# max descriptions per dispatched batch, how long /predict calls are collected into one
+# batch (0 = no cross-request batching) and seconds to drain in-flight requests on shutdown.
+ML_API_PRELOAD = os.getenv("ML_API_PRELOAD", "0") == "1"
+ML_API_WORKERS = int(os.getenv("ML_API_WORKERS", "0"))
+ML_API_BATCH_SIZE = int(os.getenv("ML_API_BATCH_SIZE", "64"))
+ML_API_BATCH_WINDOW_MS = float(os.getenv("ML_API_BATCH_WINDOW_MS", "2"))
+ML_API_DRAIN_TIMEOUT = int(os.getenv("ML_API_DRAIN_TIMEOUT", "30"))
+
+executor = None
+batcher = None
+
+
+def load_model():
+    """Load the model, importing joblib/sklearn only when serving starts"""
+    global model
+    if os.path.exists(MODEL_PATH):
+        import joblib
+
+        model = joblib.load(MODEL_PATH)
+        print("✓ Model loaded successfully")
+    else:
+        print("⚠ Model not found. Run train_model.py first.")
+
+
+def _predict_batch(descriptions):
+    """Run the model on a list of descriptions.
+
+    Executed inside pool workers, which are forked after the model is loaded
+    and therefore share it with the parent copy-on-write.
+    """
+    return [str(p) for p in model.predict(descriptions)]
+
+
+def _warm_up():
+    pass
+
+
+def _start_pool():
+    return ProcessPoolExecutor(
+        max_workers=ML_API_WORKERS,
+        mp_context=multiprocessing.get_context("fork"),
+    )
+
+
+if ML_API_PRELOAD:
+    load_model()
+
+
+class PredictionBatcher:
+    """Collect single /predict calls for ``window_ms`` and run them as one batch.
+
+    A batch is dispatched when the window closes or ``max_batch`` descriptions
+    are waiting; several batches can be in flight, one per pool worker.
+    """
+
+    def __init__(self, window_ms, max_batch):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self._running = set()
+
+    async def predict(self, description):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((description, future))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._dispatch)
+        return await future
+
+    async def drain(self):
+        """Dispatch whatever is pending and wait for all batches in flight"""
+        self._dispatch()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        try:
+            predictions = await run_inference([description for description, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global executor, batcher
+    if model is None:
+        load_model()
+    if ML_API_WORKERS > 0 and model is not None:
+        executor = _start_pool()
+        # Fork every worker now, from the main thread and before any request or
+        # threadpool thread exists, instead of on the first request's submit()
+        for future in [executor.submit(_warm_up) for _ in range(ML_API_WORKERS)]:
+            future.result()
+        print(f"✓ Inference pool started with {ML_API_WORKERS} worker processes")
+    if ML_API_BATCH_WINDOW_MS > 0:
+        batcher = PredictionBatcher(ML_API_BATCH_WINDOW_MS, ML_API_BATCH_SIZE)
+    yield
+    if batcher is not None:
+        await batcher.drain()
+        batcher = None
+    if executor is not None:
+        # Requests are already drained by uvicorn; wait for queued batches to finish
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        executor = None
+        print("✓ Inference pool shut down")
+
+
+app = FastAPI(title="Task Priority Prediction API", lifespan=lifespan)
+
 
 class TaskInput(BaseModel):
     task_description: str
 
+class BatchInput(BaseModel):
+    task_descriptions: List[str] = Field(..., min_length=1)
+
 class PredictionOutput(BaseModel):
     task_description: str
     predicted_priority: str
     confidence: str
 
+
+async def run_inference(descriptions: List[str]) -> List[str]:
+    """Predict off the event loop, splitting large inputs across the process pool"""
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        return await loop.run_in_executor(None, _predict_batch, descriptions)
+
+    chunks = [
+        descriptions[i:i + ML_API_BATCH_SIZE]
+        for i in range(0, len(descriptions), ML_API_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(*(_predict_in_pool(chunk) for chunk in chunks))
+    return [prediction for chunk in results for prediction in chunk]
+
+
+async def _predict_in_pool(chunk: List[str]) -> List[str]:
+    """Run one chunk in the pool, replacing the pool once if a worker has died"""
+    global executor
+    loop = asyncio.get_running_loop()
+    pool = executor
+    try:
+        return await loop.run_in_executor(pool, _predict_batch, chunk)
+    except BrokenProcessPool:
+        if executor is pool:
+            print("⚠ Inference pool broken, starting a new one")
+            executor = _start_pool()
+            pool.shutdown(wait=False)
+        return await loop.run_in_executor(executor, _predict_batch, chunk)
+
+
 @app.get("/")
 def read_root():
     return {
         "message": "Task Priority Prediction API",
         "model_loaded": model is not None,
+        "workers": ML_API_WORKERS,
+        "batch_window_ms": ML_API_BATCH_WINDOW_MS,
         "endpoint": "/predict"
     }
 
 @app.post("/predict", response_model=PredictionOutput)
-def predict_priority(task: TaskInput):
+async def predict_priority(task: TaskInput):
     """Predict the priority of a task"""
     if model is None:
         raise HTTPException(
             status_code=503,
             detail="Model not loaded. Run train_model.py first."
         )
-    
+
     try:
-        prediction = model.predict([task.task_description])[0]
-        
+        if batcher is not None:
+            prediction = await batcher.predict(task.task_description)
+        else:
+            prediction = (await run_inference([task.task_description]))[0]
+
         return PredictionOutput(
             task_description=task.task_description,
             predicted_priority=prediction,
@@ -50,6 +217,35 @@ def predict_priority(task: TaskInput):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict/batch", response_model=List[PredictionOutput])
+async def predict_priority_batch(batch: BatchInput):
+    """Predict the priorities of several tasks in one call"""
+    if model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Run train_model.py first."
+        )
+
+    try:
+        predictions = await run_inference(batch.task_descriptions)
+
+        return [
+            PredictionOutput(
+                task_description=description,
+                predicted_priority=prediction,
+                confidence="estimated"
+            )
+            for description, prediction in zip(batch.task_descriptions, predictions)
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
+    # Development server: one HTTP process. Use gunicorn_conf.py in production.
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        timeout_graceful_shutdown=ML_API_DRAIN_TIMEOUT,
+    )
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from task3 import ml_api
+
+
+class StubModel:
+    """Predicts 'high' for anything mentioning a bug; records every predict() call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, descriptions):
+        try:
+            asyncio.get_running_loop()
+            on_loop = True
+        except RuntimeError:
+            on_loop = False
+        self.calls.append((list(descriptions), on_loop))
+        return ["high" if "bug" in d else "low" for d in descriptions]
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    model = StubModel()
+    monkeypatch.setattr(ml_api, "model", model)
+    monkeypatch.setattr(ml_api, "ML_API_WORKERS", 0)
+    monkeypatch.setattr(ml_api, "ML_API_BATCH_WINDOW_MS", 0)
+    monkeypatch.setattr(ml_api, "ML_API_BATCH_SIZE", 64)
+    return model
+
+
+def post_concurrently(client, descriptions):
+    with ThreadPoolExecutor(max_workers=len(descriptions)) as pool:
+        return list(pool.map(
+            lambda d: client.post("/predict", json={"task_description": d}),
+            descriptions,
+        ))
+
+
+def test_predict_threadpool_path(stub_model):
+    with TestClient(ml_api.app) as client:
+        response = client.post("/predict", json={"task_description": "Fix login bug"})
+
+    assert response.status_code == 200
+    assert response.json()["predicted_priority"] == "high"
+    assert stub_model.calls == [(["Fix login bug"], False)]
+
+
+def test_predict_merges_requests_within_window(stub_model, monkeypatch):
+    monkeypatch.setattr(ml_api, "ML_API_BATCH_WINDOW_MS", 200)
+    descriptions = [f"task {i}" for i in range(5)]
+
+    with TestClient(ml_api.app) as client:
+        responses = post_concurrently(client, descriptions)
+
+    assert [r.json()["task_description"] for r in responses] == descriptions
+    assert len(stub_model.calls) == 1
+    assert sorted(stub_model.calls[0][0]) == descriptions
+
+
+def test_predict_dispatches_when_batch_is_full(stub_model, monkeypatch):
+    monkeypatch.setattr(ml_api, "ML_API_BATCH_WINDOW_MS", 10_000)
+    monkeypatch.setattr(ml_api, "ML_API_BATCH_SIZE", 3)
+
+    with TestClient(ml_api.app) as client:
+        start = time.monotonic()
+        responses = post_concurrently(client, ["a bug", "b", "c"])
+        elapsed = time.monotonic() - start
+
+    assert [r.status_code for r in responses] == [200] * 3
+    assert elapsed < 5
+    assert [len(descriptions) for descriptions, _ in stub_model.calls] == [3]
+
+
+def test_batcher_drain_resolves_pending(stub_model):
+    async def scenario():
+        batcher = ml_api.PredictionBatcher(window_ms=60_000, max_batch=100)
+        pending = [asyncio.ensure_future(batcher.predict(d)) for d in ["x bug", "y"]]
+        await asyncio.sleep(0)
+        assert not any(task.done() for task in pending)
+        await batcher.drain()
+        return [await task for task in pending]
+
+    assert asyncio.run(scenario()) == ["high", "low"]
+
+
+def test_predict_batch_keeps_order_across_chunks(stub_model, monkeypatch):
+    monkeypatch.setattr(ml_api, "ML_API_BATCH_SIZE", 2)
+    descriptions = ["bug one", "two", "bug three", "four", "five"]
+
+    with TestClient(ml_api.app) as client:
+        response = client.post("/predict/batch", json={"task_descriptions": descriptions})
+
+    assert response.status_code == 200
+    assert [p["task_description"] for p in response.json()] == descriptions
+    assert [p["predicted_priority"] for p in response.json()] == ["high", "low", "high", "low", "low"]
+
+
+def test_predict_batch_rejects_empty_list(stub_model):
+    with TestClient(ml_api.app) as client:
+        response = client.post("/predict/batch", json={"task_descriptions": []})
+
+    assert response.status_code == 422
+
+
+def test_predict_recovers_from_broken_pool(stub_model, monkeypatch):
+    monkeypatch.setattr(ml_api, "ML_API_WORKERS", 1)
+
+    with TestClient(ml_api.app) as client:
+        assert client.post("/predict", json={"task_description": "bug"}).status_code == 200
+
+        for process in list(ml_api.executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+
+        response = client.post("/predict", json={"task_description": "bug"})
+        assert response.status_code == 200
+        assert response.json()["predicted_priority"] == "high"
+        assert client.post("/predict", json={"task_description": "docs"}).status_code == 200
+
+    assert ml_api.executor is None
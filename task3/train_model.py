@@ -1,12 +1,33 @@
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import Pipeline
-import joblib
+import argparse
 import os
 
-def create_sample_data():
-    """Create sample CSV if it doesn't exist"""
+MODEL_PATH = "task3/priority_model.pkl"
+DATA_PATH = "tasks.csv"
+TRAINING_COLUMNS = ["task_description", "priority"]
+
+def model_is_current(data_path=DATA_PATH):
+    """Check that a non-empty model artifact exists and is newer than the training data"""
+    if not os.path.exists(MODEL_PATH) or os.path.getsize(MODEL_PATH) == 0:
+        return False
+    if os.path.exists(data_path):
+        return os.path.getmtime(MODEL_PATH) >= os.path.getmtime(data_path)
+    return True
+
+def load_training_data(data_path=DATA_PATH):
+    """Load only the training columns; Parquet files are memory-mapped"""
+    if data_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(data_path, columns=TRAINING_COLUMNS, memory_map=True).to_pandas()
+
+    import pandas as pd
+
+    return pd.read_csv(data_path, usecols=TRAINING_COLUMNS)
+
+def create_sample_data(data_path=DATA_PATH):
+    """Create sample training data (CSV or Parquet, by extension) if it doesn't exist"""
+    import pandas as pd
+
     data = [
         ["Fix login bug on website", "high"],
         ["Update user profile page", "low"],
@@ -27,16 +48,28 @@ def create_sample_data():
     ]
     
     df = pd.DataFrame(data, columns=["task_description", "priority"])
-    df.to_csv("tasks.csv", index=False)
-    print("✓ Sample data created: tasks.csv")
+    if data_path.endswith(".parquet"):
+        df.to_parquet(data_path, index=False)
+    else:
+        df.to_csv(data_path, index=False)
+    print(f"✓ Sample data created: {data_path}")
     return df
 
-def train_model():
-    """Train the classification model"""
-    if not os.path.exists("tasks.csv"):
-        df = create_sample_data()
+def train_model(force=False, data_path=DATA_PATH):
+    """Train the classification model, skipping it if the saved model is up to date"""
+    if not force and model_is_current(data_path):
+        print(f"✓ Model {MODEL_PATH} is up to date, skipping training")
+        return
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+    import joblib
+
+    if not os.path.exists(data_path):
+        df = create_sample_data(data_path)
     else:
-        df = pd.read_csv("tasks.csv")
+        df = load_training_data(data_path)
     
     print(f"Training on {len(df)} samples...")
     
@@ -51,8 +84,8 @@ def train_model():
     y = df['priority']
     model.fit(X, y)
     
-    joblib.dump(model, 'task3/priority_model.pkl')
-    print("✓ Model trained and saved to task3/priority_model.pkl")
+    joblib.dump(model, MODEL_PATH)
+    print(f"✓ Model trained and saved to {MODEL_PATH}")
 
     test_tasks = [
         "Fix critical bug",
@@ -66,4 +99,8 @@ def train_model():
         print(f"  '{task}' -> {prediction}")
 
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the task priority model")
+    parser.add_argument("--force", action="store_true", help="retrain even if the model is up to date")
+    parser.add_argument("--data", default=DATA_PATH, help="training data, .csv or .parquet")
+    args = parser.parse_args()
+    train_model(force=args.force, data_path=args.data)
\ No newline at end of file